@@ -5,6 +5,9 @@ from red_social.comunidades import DeteccionPorPropagacion, mostrar_resultados_c
 from red_social.analisis import analisis_camino_promedio
 from red_social.mst import MinimumSpanningTree, generar_estadisticas_mst
 from red_social.visualizacion import visualizar_comunidades, visualizar_red_general
+from red_social.muestreo import sesgo_muestreo
+from red_social.triangulos import estadisticas_triangulos_comunidades
+from red_social.exportacion import exportar_resultados
 
 def main():
     cargador = CargadorRedSocial()
@@ -38,6 +41,7 @@ def main():
     
     subgrafo = cargador.obtener_subgrafo(tamaño=tamaño_subgrafo) #con la funcion obgterner subgrafo solo agarramos  nodos seleccionados que son mutuas (bidireccionales).
     tiempos['Extracción Subgrafo'] = time.time() - inicio
+    sesgo_muestreo(cargador.conexiones, subgrafo)
 
     print("\n" + "="*50)
     print("DETECCIÓN DE COMUNIDADES (Label Propagation)".center(50))
@@ -58,10 +62,14 @@ def main():
     generar_estadisticas_comunidades(comunidades, subgrafo, "Label Propagation")
     tiempos['Visualización Comunidades'] = time.time() - inicio
 
+    inicio = time.time()
+    triangulos = estadisticas_triangulos_comunidades(comunidades, subgrafo, aproximado=True) #aproximado=False para el conteo exacto
+    tiempos['Triángulos y Clustering'] = time.time() - inicio
+
     print("\n" + "="*50)
     print("ANÁLISIS DE CAMINOS MÁS CORTOS".center(50))
     print("="*50)
-    analisis_camino_promedio(subgrafo, sample_size=1000)
+    _, pares_caminos = analisis_camino_promedio(subgrafo, sample_size=1000, devolver_pares=True)
 
     print("\n" + "="*50)
     print("VISUALIZACIÓN INTERACTIVA DE LA RED".center(50))
@@ -82,6 +90,11 @@ def main():
     generar_estadisticas_mst(mst, subgrafo)
     tiempos['Visualización MST'] = time.time() - inicio
 
+    inicio = time.time()
+    exportar_resultados("resultados", comunidades=comunidades, subgrafo=subgrafo, mst_aristas=mst,
+                        pares=pares_caminos, triangulos=triangulos)
+    tiempos['Exportación Resultados'] = time.time() - inicio
+
     print("\n" + "="*50)
     print("RESUMEN DE TIEMPOS".center(50))
     print("="*50)
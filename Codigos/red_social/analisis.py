@@ -29,17 +29,24 @@ def bfs_distancia(grafo, origen, destino):
     return None  # No hay camino
 
 
-def analisis_camino_promedio(subgrafo, sample_size=1000, mostrar_grafico=True):
+def analisis_camino_promedio(subgrafo, sample_size=1000, mostrar_grafico=True, devolver_pares=False):
+    """
+    Longitud promedio de caminos más cortos sobre pares aleatorios.
+    Con devolver_pares=True devuelve (promedio, [(origen, destino, distancia)]),
+    con distancia None cuando no hay camino.
+    """
     print(f"\nCalculando longitud promedio de caminos más cortos (muestra: {sample_size})")
     inicio = time.time()
 
     nodos = list(subgrafo.keys())
     total_distancias = []
+    pares = []
     errores = 0
 
     for _ in range(sample_size):
         origen, destino = random.sample(nodos, 2)
         distancia = bfs_distancia(subgrafo, origen, destino)
+        pares.append((origen, destino, distancia))
         if distancia is not None:
             total_distancias.append(distancia)
         else:
@@ -47,7 +54,7 @@ def analisis_camino_promedio(subgrafo, sample_size=1000, mostrar_grafico=True):
 
     if not total_distancias:
         print("No se encontraron caminos válidos.")
-        return 0
+        return (0, pares) if devolver_pares else 0
 
     promedio = sum(total_distancias) / len(total_distancias)
     fin = time.time()
@@ -68,7 +75,7 @@ def analisis_camino_promedio(subgrafo, sample_size=1000, mostrar_grafico=True):
         except ImportError:
             print("matplotlib no está instalado. Ejecuta: pip install matplotlib")
 
-    return promedio
+    return (promedio, pares) if devolver_pares else promedio
 
 
 
@@ -7,6 +7,9 @@ import random
 import math
 import plotly.graph_objects as go
 import plotly.express as px
+from red_social.muestreo import MuestreoGrafo, ESTRATEGIAS, construir_subgrafo, leer_lineas_conexiones
+from red_social.compresion import AdyacenciaComprimida
+
 
 
 
@@ -46,16 +49,10 @@ class CargadorRedSocial:
         contador = total_conex = 0
         
         try:
-            with open(archivo, 'r') as f:
-                for line_num, linea in enumerate(f, 1):
-                    try:
-                        ids = list(map(int, filter(None, linea.strip().split(','))))
-                        if ids:
-                            self.conexiones[ids[0]] = ids[1:]
-                            contador += 1
-                            total_conex += len(ids[1:])
-                    except Exception as e:
-                        print(f"Línea {line_num}: Error - {e}")
+            for nodo, vecinos in leer_lineas_conexiones(archivo):
+                self.conexiones[nodo] = vecinos
+                contador += 1
+                total_conex += len(vecinos)
         
         except Exception as e:
             print(f"Error con conexiones: {e}")
@@ -63,15 +60,47 @@ class CargadorRedSocial:
         print(f"{contador:,} usuarios con {total_conex:,} conexiones cargadas en {time.time() - inicio:.2f}s")
         print(f"Promedio: {total_conex/contador:.1f} conexiones/usuario")
 
-    def obtener_subgrafo(self, tamaño=50000):
-        """Extrae subgrafo usando muestreo más inteligente"""
-        print(f"\nExtrayendo subgrafo de {tamaño:,} nodos...")
+    def comprimir_conexiones(self, archivo=None):
+        """Reemplaza las conexiones por su versión comprimida y opcionalmente la guarda"""
+        if not self.conexiones:
+            print("No hay conexiones cargadas.")
+            return None
+
+        self.conexiones = AdyacenciaComprimida.desde_diccionario(self.conexiones)
+        if archivo:
+            self.conexiones.guardar(archivo)
+            print(f"Adyacencia comprimida guardada en {archivo}")
+        return self.conexiones.estadisticas()
+
+    def cargar_conexiones_comprimidas(self, archivo):
+        """Abre (mmap) una adyacencia guardada con comprimir_conexiones"""
+        print(f"\nAbriendo adyacencia comprimida {archivo}...")
+        inicio = time.time()
+        self.conexiones = AdyacenciaComprimida.cargar(archivo)
+        print(f"{len(self.conexiones):,} usuarios mapeados en {time.time() - inicio:.2f}s")
+
+    def obtener_subgrafo(self, tamaño=50000, estrategia='hubs', semilla=None, **opciones):
+        """
+        Extrae subgrafo usando muestreo más inteligente.
+        estrategia: 'hubs' (tercio de mayor grado + aleatorios), 'caminata',
+        'incendio', 'bola_nieve' o 'aristas' (ver red_social.muestreo)
+        """
+        print(f"\nExtrayendo subgrafo de {tamaño:,} nodos (estrategia: {estrategia})...")
         inicio = time.time()
         
         if not self.conexiones:
             print("No hay conexiones cargadas.")
             return {}
         
+        if estrategia != 'hubs':
+            if estrategia not in ESTRATEGIAS:
+                raise ValueError(f"Estrategia de muestreo desconocida: {estrategia}")
+            muestreo = MuestreoGrafo(self.conexiones, semilla=semilla)
+            subgrafo = ESTRATEGIAS[estrategia](muestreo, tamaño, **opciones)
+            print(f"Subgrafo: {len(subgrafo):,} nodos, {sum(len(v) for v in subgrafo.values())//2:,} aristas en {time.time()-inicio:.2f}s")
+            return subgrafo
+        
+        rng = random.Random(semilla)
         nodos_ordenados = sorted(
             [(nodo, len(vecinos)) for nodo, vecinos in self.conexiones.items()],
             key=lambda x: x[1], reverse=True
@@ -88,22 +117,14 @@ class CargadorRedSocial:
 
         # Si hay suficientes nodos para muestrear
         if len(resto_nodos) >= aleatorios_count:
-            nodos_aleatorios = random.sample(resto_nodos, aleatorios_count)
+            nodos_aleatorios = rng.sample(resto_nodos, aleatorios_count)
         else:
             nodos_aleatorios = resto_nodos  # Tomar todos los disponibles
 
         nodos_seleccionados = set(hubs + nodos_aleatorios)
         
         # Construir subgrafo bidireccional
-        subgrafo = defaultdict(list)
-        for nodo in nodos_seleccionados:
-            if nodo in self.conexiones:
-                for vecino in self.conexiones[nodo]:
-                    if vecino in nodos_seleccionados:
-                        if vecino not in subgrafo[nodo]:
-                            subgrafo[nodo].append(vecino)
-                        if nodo not in subgrafo[vecino]:
-                            subgrafo[vecino].append(nodo)
+        subgrafo = construir_subgrafo(self.conexiones, nodos_seleccionados)
 
         print(f"Subgrafo: {len(subgrafo):,} nodos, {sum(len(v) for v in subgrafo.values())//2:,} aristas en {time.time()-inicio:.2f}s")
-        return dict(subgrafo)
+        return subgrafo
@@ -0,0 +1,304 @@
+import time
+import sys
+import mmap
+import struct
+import bisect
+from array import array
+
+
+# Cabecera: magia, versión, número de nodos, bytes de listas codificadas,
+# id base (ids consecutivos) y si el archivo incluye el arreglo de ids
+_CABECERA = struct.Struct('<4sIQQqI4x')
+_MAGIA = b'ADYC'
+_VERSION = 2
+
+# Cada bloque de nodos guarda un offset absoluto (uint64) y cada nodo un
+# offset relativo al inicio de su bloque (uint32): ~4.1 bytes de índice por nodo
+_BITS_BLOQUE = 6
+_NODOS_BLOQUE = 1 << _BITS_BLOQUE
+_MAX_RELATIVO = 2**32 - 1
+
+
+def _escribir_varint(buffer, valor):
+    while valor >= 0x80:
+        buffer.append((valor & 0x7F) | 0x80)
+        valor >>= 7
+    buffer.append(valor)
+
+
+def _zigzag(valor):
+    return valor * 2 if valor >= 0 else -valor * 2 - 1
+
+
+def _deszigzag(valor):
+    return valor >> 1 if not valor & 1 else -((valor + 1) >> 1)
+
+
+def _a_little_endian(arreglo):
+    if sys.byteorder != 'little':
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo
+
+
+class AdyacenciaComprimida:
+    """
+    Lista de adyacencia comprimida {id: [vecinos]} de solo lectura.
+    Cada lista se guarda ordenada como: grado, primer vecino relativo al id del
+    nodo (zigzag) y después los huecos entre vecinos consecutivos, todo en
+    varint. Un índice de offsets por bloques permite decodificar cualquier
+    lista sin tocar las demás, y el formato en disco se puede abrir con mmap.
+    Si los ids son consecutivos (caso habitual 1..N) no se guardan: basta el id base.
+    Se comporta como un dict (get, [], in, keys, items, len) para que BFS,
+    Label Propagation y obtener_subgrafo funcionen sin cambios.
+    """
+
+    def __init__(self, n, base, ids, bloques, relativos, datos, mapa=None, vista=None):
+        self.n = n
+        self.base = base            # id del primer nodo si los ids son consecutivos
+        self.ids = ids              # ids ordenados (int64) o None si son consecutivos
+        self.bloques = bloques      # offset absoluto de cada bloque de nodos (uint64)
+        self.relativos = relativos  # offset de cada nodo dentro de su bloque (uint32, n + 1)
+        self.datos = datos          # listas codificadas en varint
+        self._mapa = mapa           # mmap abierto, si se cargó desde disco
+        self._vista = vista         # memoryview sobre el mmap
+
+    @classmethod
+    def desde_diccionario(cls, conexiones):
+        """Comprime un dict {id: [vecinos]} como el que produce cargar_conexiones"""
+        print(f"\nComprimiendo adyacencia de {len(conexiones):,} nodos...")
+        inicio = time.time()
+
+        ordenados = sorted(conexiones)
+        n = len(ordenados)
+        consecutivos = n == 0 or ordenados[-1] - ordenados[0] + 1 == n
+        base = ordenados[0] if n else 0
+        ids = None if consecutivos else array('q', ordenados)
+
+        bloques = array('Q')
+        relativos = array('I')
+        datos = bytearray()
+
+        for i in range(n + 1):
+            if i % _NODOS_BLOQUE == 0:
+                bloques.append(len(datos))
+            relativo = len(datos) - bloques[-1]
+            if relativo > _MAX_RELATIVO:
+                raise ValueError("Bloque de adyacencia mayor que 4 GB")
+            relativos.append(relativo)
+            if i == n:
+                break
+
+            nodo = ordenados[i]
+            vecinos = sorted(set(conexiones[nodo]))
+            _escribir_varint(datos, len(vecinos))
+            if vecinos:
+                _escribir_varint(datos, _zigzag(vecinos[0] - nodo))
+                anterior = vecinos[0]
+                for vecino in vecinos[1:]:
+                    _escribir_varint(datos, vecino - anterior - 1)
+                    anterior = vecino
+
+        adyacencia = cls(n, base, ids, bloques, relativos, bytes(datos))
+        print(f"Adyacencia comprimida en {time.time() - inicio:.2f}s "
+              f"(ratio {adyacencia.estadisticas()['ratio_compresion']:.2f}x frente a CSR int32)")
+        return adyacencia
+
+    def guardar(self, archivo):
+        """Guarda cabecera + ids (si hacen falta) + índice + datos en un único archivo binario"""
+        with open(archivo, 'wb') as f:
+            f.write(_CABECERA.pack(_MAGIA, _VERSION, self.n, len(self.datos), self.base,
+                                   self.ids is not None))
+            if self.ids is not None:
+                _a_little_endian(array('q', self.ids)).tofile(f)
+            _a_little_endian(array('Q', self.bloques)).tofile(f)
+            _a_little_endian(array('I', self.relativos)).tofile(f)
+            f.write(self.datos)
+
+    @classmethod
+    def cargar(cls, archivo):
+        """Abre un archivo guardado con `guardar` mediante mmap (sin copiarlo a memoria)"""
+        if sys.byteorder != 'little':
+            raise ValueError("El mapeo en memoria requiere una plataforma little-endian")
+
+        with open(archivo, 'rb') as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        valido = len(mapa) >= _CABECERA.size
+        if valido:
+            magia, version, n, tamaño_datos, base, tiene_ids = _CABECERA.unpack_from(mapa, 0)
+            valido = magia == _MAGIA and version == _VERSION
+        if valido:
+            inicio_ids = _CABECERA.size
+            inicio_bloques = inicio_ids + (8 * n if tiene_ids else 0)
+            inicio_relativos = inicio_bloques + 8 * ((n >> _BITS_BLOQUE) + 1)
+            inicio_datos = inicio_relativos + 4 * (n + 1)
+            # Un archivo truncado daría vistas más cortas que el índice
+            valido = inicio_datos + tamaño_datos <= len(mapa)
+        if not valido:
+            mapa.close()
+            raise ValueError(f"{archivo} no es una adyacencia comprimida válida")
+
+        vista = memoryview(mapa)
+        ids = vista[inicio_ids:inicio_bloques].cast('q') if tiene_ids else None
+        bloques = vista[inicio_bloques:inicio_relativos].cast('Q')
+        relativos = vista[inicio_relativos:inicio_datos].cast('I')
+        datos = vista[inicio_datos:inicio_datos + tamaño_datos]
+        return cls(n, base, ids, bloques, relativos, datos, mapa=mapa, vista=vista)
+
+    def cerrar(self):
+        """Libera el mmap (las listas ya decodificadas siguen siendo válidas)"""
+        if self._mapa is not None:
+            for vista in (self.ids, self.bloques, self.relativos, self.datos, self._vista):
+                if vista is not None:
+                    vista.release()
+            self._mapa.close()
+            self._mapa = None
+
+    def _indice(self, nodo):
+        if self.ids is None:
+            i = nodo - self.base
+            return i if 0 <= i < self.n else -1
+        i = bisect.bisect_left(self.ids, nodo)
+        return i if i < self.n and self.ids[i] == nodo else -1
+
+    def _id(self, i):
+        return self.base + i if self.ids is None else self.ids[i]
+
+    def _offset(self, i):
+        return self.bloques[i >> _BITS_BLOQUE] + self.relativos[i]
+
+    def _decodificar(self, i):
+        datos = self.datos
+        pos = self.bloques[i >> _BITS_BLOQUE] + self.relativos[i]
+
+        # Los valores < 128 (la mayoría de huecos) ocupan un solo byte
+        grado = desplazamiento = 0
+        while True:
+            byte = datos[pos]
+            pos += 1
+            grado |= (byte & 0x7F) << desplazamiento
+            if byte < 0x80:
+                break
+            desplazamiento += 7
+
+        vecinos = []
+        actual = self.base + i if self.ids is None else self.ids[i]
+        primero = True
+        for _ in range(grado):
+            valor = desplazamiento = 0
+            while True:
+                byte = datos[pos]
+                pos += 1
+                valor |= (byte & 0x7F) << desplazamiento
+                if byte < 0x80:
+                    break
+                desplazamiento += 7
+            if primero:
+                actual += _deszigzag(valor)
+                primero = False
+            else:
+                actual += valor + 1
+            vecinos.append(actual)
+        return vecinos
+
+    def vecinos(self, nodo):
+        i = self._indice(nodo)
+        if i < 0:
+            raise KeyError(nodo)
+        return self._decodificar(i)
+
+    def _grado_en(self, i):
+        datos = self.datos
+        pos = self._offset(i)
+        grado = desplazamiento = 0
+        while True:
+            byte = datos[pos]
+            pos += 1
+            grado |= (byte & 0x7F) << desplazamiento
+            if byte < 0x80:
+                return grado
+            desplazamiento += 7
+
+    def grado(self, nodo):
+        """Grado del nodo leyendo solo el primer varint de su lista"""
+        i = self._indice(nodo)
+        return self._grado_en(i) if i >= 0 else 0
+
+    def __getitem__(self, nodo):
+        return self.vecinos(nodo)
+
+    def get(self, nodo, defecto=None):
+        i = self._indice(nodo)
+        return self._decodificar(i) if i >= 0 else defecto
+
+    def __contains__(self, nodo):
+        return self._indice(nodo) >= 0
+
+    def __len__(self):
+        return self.n
+
+    def __iter__(self):
+        return iter(range(self.base, self.base + self.n)) if self.ids is None else iter(self.ids)
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (self._decodificar(i) for i in range(self.n))
+
+    def items(self):
+        return ((self._id(i), self._decodificar(i)) for i in range(self.n))
+
+    def bytes_indice(self):
+        """Bytes de ids + offsets (sin las listas codificadas)"""
+        bytes_ids = 8 * self.n if self.ids is not None else 0
+        return bytes_ids + 8 * len(self.bloques) + 4 * len(self.relativos)
+
+    def estadisticas(self):
+        """Tamaño comprimido frente a un CSR int32 equivalente (offsets + vecinos)"""
+        n = self.n
+        aristas = sum(self._grado_en(i) for i in range(n))
+        bytes_csr = 4 * (n + 1) + 4 * aristas
+        bytes_comprimidos = self.bytes_indice() + len(self.datos)
+        return {
+            'nodos': n,
+            'aristas': aristas,
+            'bytes_csr_int32': bytes_csr,
+            'bytes_comprimidos': bytes_comprimidos,
+            'bytes_indice': self.bytes_indice(),
+            'bytes_listas': len(self.datos),
+            'bits_por_arista': 8 * len(self.datos) / aristas if aristas else 0,
+            'ratio_compresion': bytes_csr / bytes_comprimidos if bytes_comprimidos else 0,
+        }
+
+    def medir_decodificacion(self, max_nodos=None):
+        """Decodifica todas las listas (o las primeras max_nodos) y mide el rendimiento"""
+        total_nodos = self.n if max_nodos is None else min(max_nodos, self.n)
+        inicio = time.time()
+        aristas = 0
+        for i in range(total_nodos):
+            aristas += len(self._decodificar(i))
+        duracion = max(time.time() - inicio, 1e-9)
+
+        bytes_leidos = self._offset(total_nodos) - self._offset(0) if total_nodos else 0
+        resultado = {
+            'nodos': total_nodos,
+            'aristas': aristas,
+            'segundos': duracion,
+            'aristas_por_segundo': aristas / duracion,
+            'mb_por_segundo': bytes_leidos / duracion / 1e6,
+        }
+
+        print(f"\n📦 ADYACENCIA COMPRIMIDA:")
+        stats = self.estadisticas()
+        print(f"   • Nodos: {stats['nodos']:,}, aristas: {stats['aristas']:,}")
+        print(f"   • CSR int32: {stats['bytes_csr_int32'] / 1e6:.1f} MB")
+        print(f"   • Comprimida: {stats['bytes_comprimidos'] / 1e6:.1f} MB "
+              f"(índice {stats['bytes_indice'] / 1e6:.1f} MB, "
+              f"{stats['bits_por_arista']:.1f} bits/arista en las listas)")
+        print(f"   • Ratio de compresión: {stats['ratio_compresion']:.2f}x")
+        print(f"   • Decodificación: {resultado['aristas_por_segundo'] / 1e6:.2f} M aristas/s "
+              f"({resultado['mb_por_segundo']:.1f} MB/s)")
+
+        return resultado
@@ -0,0 +1,190 @@
+import os
+import glob
+import time
+import polars as pl
+
+
+FORMATOS = {
+    'parquet': 'parquet',
+    'ipc': 'arrow',
+}
+
+
+def _limpiar_partes(directorio):
+    """Elimina las partes de una exportación anterior en el mismo directorio, en cualquier formato"""
+    for extension in FORMATOS.values():
+        for archivo in glob.glob(os.path.join(directorio, f"part-*.{extension}")):
+            os.remove(archivo)
+
+
+def exportar_por_lotes(filas, esquema, directorio, formato='parquet', lote=1000000):
+    """
+    Escribe las filas (tuplas en el orden de `esquema`) en partes de como máximo
+    `lote` filas: directorio/part-00000.parquet, part-00001.parquet, ...
+    Solo un lote vive en memoria a la vez, así que exportar 10M filas no
+    duplica los resultados ya calculados.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido: {formato} (usar 'parquet' o 'ipc')")
+
+    extension = FORMATOS[formato]
+    os.makedirs(directorio, exist_ok=True)
+    _limpiar_partes(directorio)
+
+    columnas = list(esquema)
+    partes = total = 0
+
+    def escribir(buffers):
+        nonlocal partes
+        df = pl.DataFrame(dict(zip(columnas, buffers)), schema=esquema)
+        ruta = os.path.join(directorio, f"part-{partes:05d}.{extension}")
+        if formato == 'parquet':
+            df.write_parquet(ruta, compression='zstd')
+        else:
+            df.write_ipc(ruta, compression='zstd')
+        partes += 1
+
+    buffers = [[] for _ in columnas]
+    for fila in filas:
+        for buffer, valor in zip(buffers, fila):
+            buffer.append(valor)
+        total += 1
+        if len(buffers[0]) >= lote:
+            escribir(buffers)
+            buffers = [[] for _ in columnas]
+
+    # Siempre al menos una parte, para que el lector conozca el esquema
+    if buffers[0] or partes == 0:
+        escribir(buffers)
+
+    return {'directorio': directorio, 'filas': total, 'partes': partes}
+
+
+def leer_resultados(directorio, perezoso=False):
+    """
+    Lee todas las partes de una exportación. Con perezoso=True devuelve un
+    LazyFrame para filtrar o agregar sin cargar todo en memoria.
+    """
+    presentes = [
+        formato for formato, extension in FORMATOS.items()
+        if glob.glob(os.path.join(directorio, f"part-*.{extension}"))
+    ]
+    if not presentes:
+        raise FileNotFoundError(f"No hay resultados exportados en {directorio}")
+    if len(presentes) > 1:
+        raise ValueError(f"{directorio} mezcla partes en varios formatos: {', '.join(presentes)}")
+
+    patron = os.path.join(directorio, f"part-*.{FORMATOS[presentes[0]]}")
+    lazy = pl.scan_parquet(patron) if presentes[0] == 'parquet' else pl.scan_ipc(patron)
+
+    return lazy if perezoso else lazy.collect()
+
+
+def exportar_comunidades(comunidades, directorio, formato='parquet', lote=1000000):
+    """Etiquetas usuario -> comunidad"""
+    filas = (
+        (nodo, i)
+        for i, comunidad in enumerate(comunidades)
+        for nodo in comunidad
+    )
+    esquema = {'usuario': pl.Int64, 'comunidad': pl.Int64}
+    return exportar_por_lotes(filas, esquema, directorio, formato, lote)
+
+
+def exportar_estadisticas_comunidades(comunidades, subgrafo, directorio, triangulos=None,
+                                      formato='parquet', lote=1000000):
+    """
+    Estadísticas por comunidad: tamaño, conexiones internas/externas y cohesión.
+    `triangulos` es el resultado de estadisticas_triangulos_comunidades; si se
+    pasa, se añaden triángulos internos, su densidad y si el valor es una
+    estimación por muestreo. Los valores ausentes se exportan como nulos.
+    """
+    nodo_a_comunidad = {}
+    for i, comunidad in enumerate(comunidades):
+        for nodo in comunidad:
+            nodo_a_comunidad[nodo] = i
+
+    internas = [0] * len(comunidades)
+    externas = [0] * len(comunidades)
+    for nodo, vecinos in subgrafo.items():
+        com_nodo = nodo_a_comunidad.get(nodo)
+        if com_nodo is None:
+            continue
+        for vecino in vecinos:
+            com_vecino = nodo_a_comunidad.get(vecino)
+            if com_vecino is None:
+                continue
+            if com_nodo == com_vecino:
+                internas[com_nodo] += 1
+            else:
+                externas[com_nodo] += 1
+
+    esquema = {
+        'comunidad': pl.Int64,
+        'tamaño': pl.Int64,
+        'conexiones_internas': pl.Int64,
+        'conexiones_externas': pl.Int64,
+        'cohesion': pl.Float64,
+    }
+    por_comunidad = triangulos['comunidades'] if triangulos else None
+    if por_comunidad:
+        esquema['triangulos'] = pl.Int64
+        esquema['densidad_triangulos'] = pl.Float64
+        esquema['triangulos_aproximado'] = pl.Boolean
+
+    def filas():
+        for i, comunidad in enumerate(comunidades):
+            # Las internas se cuentan desde ambos extremos; las externas una vez por comunidad
+            internas_i = internas[i] // 2
+            total = internas_i + externas[i]
+            fila = (i, len(comunidad), internas_i, externas[i], internas_i / total if total else 0.0)
+            if por_comunidad:
+                c = por_comunidad[i]
+                densidad = c['densidad_triangulos']
+                fila += (c['triangulos'], None if densidad is None else float(densidad),
+                         c.get('aproximado', triangulos['aproximado']))
+            yield fila
+
+    return exportar_por_lotes(filas(), esquema, directorio, formato, lote)
+
+
+def exportar_aristas_mst(mst_aristas, directorio, formato='parquet', lote=1000000):
+    """Aristas del MST (origen, destino, peso en km)"""
+    esquema = {'origen': pl.Int64, 'destino': pl.Int64, 'peso_km': pl.Float64}
+    return exportar_por_lotes(iter(mst_aristas), esquema, directorio, formato, lote)
+
+
+def exportar_caminos(pares, directorio, formato='parquet', lote=1000000):
+    """Pares muestreados por analisis_camino_promedio (distancia nula si no hay camino)"""
+    esquema = {'origen': pl.Int64, 'destino': pl.Int64, 'distancia': pl.Int64}
+    return exportar_por_lotes(iter(pares), esquema, directorio, formato, lote)
+
+
+def exportar_resultados(directorio, comunidades=None, subgrafo=None, mst_aristas=None, pares=None,
+                        triangulos=None, formato='parquet', lote=1000000):
+    """Exporta todos los resultados disponibles, cada uno en su subdirectorio"""
+    print(f"\n{'='*60}")
+    print(f"EXPORTACIÓN DE RESULTADOS ({formato.upper()})".center(60))
+    print(f"{'='*60}")
+    inicio = time.time()
+
+    exportados = {}
+    if comunidades is not None:
+        exportados['comunidades'] = exportar_comunidades(
+            comunidades, os.path.join(directorio, 'comunidades'), formato, lote)
+        if subgrafo is not None:
+            exportados['estadisticas_comunidades'] = exportar_estadisticas_comunidades(
+                comunidades, subgrafo, os.path.join(directorio, 'estadisticas_comunidades'),
+                triangulos, formato, lote)
+    if mst_aristas is not None:
+        exportados['mst'] = exportar_aristas_mst(
+            mst_aristas, os.path.join(directorio, 'mst'), formato, lote)
+    if pares is not None:
+        exportados['caminos'] = exportar_caminos(
+            pares, os.path.join(directorio, 'caminos'), formato, lote)
+
+    for nombre, info in exportados.items():
+        print(f"   • {nombre}: {info['filas']:,} filas en {info['partes']} partes -> {info['directorio']}")
+    print(f"Exportación completada en {time.time() - inicio:.2f}s")
+
+    return exportados
@@ -10,6 +10,17 @@ import plotly.express as px
 
 
 
+def distancia_haversine(lat1, lon1, lat2, lon2):
+    """Distancia en km entre dos coordenadas"""
+    R = 6371
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    return R * c
+
+
 ##AQUI EL ARBOL DE EXPANSION
 
 class MinimumSpanningTree:
@@ -20,13 +31,7 @@ class MinimumSpanningTree:
         self.rango = {}
 
     def calcular_distancia_haversine(self, lat1, lon1, lat2, lon2):
-        R = 6371
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-        return R * c
+        return distancia_haversine(lat1, lon1, lat2, lon2)
 
     def encontrar(self, nodo):
         if self.padre[nodo] != nodo:
@@ -0,0 +1,312 @@
+import time
+import random
+import bisect
+import itertools
+from collections import defaultdict, deque, Counter
+
+
+def construir_subgrafo(conexiones, nodos_seleccionados):
+    """Construye el subgrafo bidireccional inducido por los nodos seleccionados"""
+    # dict de dicts: conserva el orden de inserción y evita vecinos repetidos en O(1)
+    subgrafo = defaultdict(dict)
+    for nodo in nodos_seleccionados:
+        for vecino in conexiones.get(nodo, []):
+            if vecino in nodos_seleccionados:
+                subgrafo[nodo][vecino] = None
+                subgrafo[vecino][nodo] = None
+
+    return {nodo: list(vecinos) for nodo, vecinos in subgrafo.items()}
+
+
+def construir_desde_aristas(aristas):
+    """Construye un grafo bidireccional a partir de una lista de aristas (u, v)"""
+    grafo = defaultdict(dict)
+    for u, v in aristas:
+        if u != v:
+            grafo[u][v] = None
+            grafo[v][u] = None
+
+    return {nodo: list(vecinos) for nodo, vecinos in grafo.items()}
+
+
+def leer_lineas_conexiones(archivo):
+    """Recorre el archivo de conexiones (id,id1,id2,...) devolviendo (id, [vecinos])"""
+    with open(archivo, 'r') as f:
+        for line_num, linea in enumerate(f, 1):
+            try:
+                ids = list(map(int, filter(None, linea.strip().split(','))))
+            except ValueError as e:
+                print(f"Línea {line_num}: Error - {e}")
+                continue
+            if ids:
+                yield ids[0], ids[1:]
+
+
+class MuestreoGrafo:
+    """
+    Estrategias de muestreo sobre un grafo en memoria {id: [vecinos]}.
+    Todas devuelven el subgrafo bidireccional inducido por los nodos elegidos.
+    """
+
+    def __init__(self, grafo, semilla=None):
+        self.grafo = grafo
+        self.rng = random.Random(semilla)
+        self._nodos = None
+
+    def _nodos_lista(self):
+        if self._nodos is None:
+            self._nodos = list(self.grafo.keys())
+        return self._nodos
+
+    def _nodo_aleatorio(self, excluidos):
+        """Nodo aleatorio aún no seleccionado (salto cuando una exploración se estanca)"""
+        nodos = self._nodos_lista()
+        for _ in range(100):
+            nodo = self.rng.choice(nodos)
+            if nodo not in excluidos:
+                return nodo
+        restantes = [nodo for nodo in nodos if nodo not in excluidos]
+        return self.rng.choice(restantes) if restantes else None
+
+    def caminata_aleatoria(self, tamaño, prob_reinicio=0.15, pasos_sin_avance=1000):
+        """Random walk con reinicio al nodo inicial; salta a otro nodo si se estanca"""
+        tamaño = min(tamaño, len(self.grafo))
+        seleccionados = set()
+        if tamaño == 0:
+            return {}
+
+        inicio = actual = self._nodo_aleatorio(seleccionados)
+        seleccionados.add(actual)
+        estancado = 0
+
+        while len(seleccionados) < tamaño:
+            vecinos = self.grafo.get(actual)
+            if not vecinos or estancado >= pasos_sin_avance:
+                inicio = actual = self._nodo_aleatorio(seleccionados)
+                seleccionados.add(actual)
+                estancado = 0
+                continue
+
+            if self.rng.random() < prob_reinicio:
+                actual = inicio
+            else:
+                actual = self.rng.choice(vecinos)
+
+            if actual in seleccionados:
+                estancado += 1
+            else:
+                seleccionados.add(actual)
+                estancado = 0
+
+        return construir_subgrafo(self.grafo, seleccionados)
+
+    def incendio_forestal(self, tamaño, prob_avance=0.7):
+        """Forest fire: cada nodo quemado propaga el fuego a un número geométrico de vecinos"""
+        tamaño = min(tamaño, len(self.grafo))
+        seleccionados = set()
+        # Cola FIFO: el fuego avanza por anillos desde el foco, como en Leskovec y Faloutsos
+        frente = deque()
+
+        while len(seleccionados) < tamaño:
+            if not frente:
+                nodo = self._nodo_aleatorio(seleccionados)
+                seleccionados.add(nodo)
+                frente.append(nodo)
+                continue
+
+            nodo = frente.popleft()
+            candidatos = [v for v in self.grafo.get(nodo, []) if v not in seleccionados]
+            # Número de vecinos a quemar ~ Geométrica con media p / (1 - p)
+            quemar = 0
+            while self.rng.random() < prob_avance:
+                quemar += 1
+            quemar = min(quemar, len(candidatos), tamaño - len(seleccionados))
+
+            for vecino in self.rng.sample(candidatos, quemar):
+                seleccionados.add(vecino)
+                frente.append(vecino)
+
+        return construir_subgrafo(self.grafo, seleccionados)
+
+    def bola_de_nieve(self, tamaño, semillas=1, max_vecinos=None):
+        """Snowball / BFS desde nodos semilla, con un máximo opcional de vecinos por nodo"""
+        tamaño = min(tamaño, len(self.grafo))
+        seleccionados = set()
+        cola = []
+        indice = 0
+
+        while len(seleccionados) < tamaño:
+            if indice >= len(cola):
+                for _ in range(semillas):
+                    nodo = self._nodo_aleatorio(seleccionados)
+                    if nodo is None or len(seleccionados) >= tamaño:
+                        break
+                    seleccionados.add(nodo)
+                    cola.append(nodo)
+                continue
+
+            nodo = cola[indice]
+            indice += 1
+            vecinos = [v for v in self.grafo.get(nodo, []) if v not in seleccionados]
+            if max_vecinos is not None and len(vecinos) > max_vecinos:
+                vecinos = self.rng.sample(vecinos, max_vecinos)
+
+            for vecino in vecinos:
+                if len(seleccionados) >= tamaño:
+                    break
+                seleccionados.add(vecino)
+                cola.append(vecino)
+
+        return construir_subgrafo(self.grafo, seleccionados)
+
+    def aristas_inducidas(self, tamaño):
+        """Induced edge sampling (TIES): elige aristas uniformes y añade sus extremos"""
+        tamaño = min(tamaño, len(self.grafo))
+        nodos = self._nodos_lista()
+        # Elegir un nodo con probabilidad ∝ grado y luego un vecino uniforme = arista uniforme
+        acumulados = list(itertools.accumulate(len(self.grafo[nodo]) for nodo in nodos))
+        total = acumulados[-1] if acumulados else 0
+        seleccionados = set()
+
+        intentos = 0
+        while total and len(seleccionados) < tamaño and intentos < 20 * tamaño:
+            intentos += 1
+            nodo = nodos[bisect.bisect_right(acumulados, self.rng.random() * total)]
+            vecino = self.rng.choice(self.grafo[nodo])
+            seleccionados.add(nodo)
+            if len(seleccionados) < tamaño:
+                seleccionados.add(vecino)
+
+        # Completar con nodos aleatorios si el grafo no tiene suficientes aristas
+        while len(seleccionados) < tamaño:
+            seleccionados.add(self._nodo_aleatorio(seleccionados))
+
+        return construir_subgrafo(self.grafo, seleccionados)
+
+
+class MuestreoReservorio:
+    """
+    Muestreo en una sola pasada sobre el archivo de conexiones (reservoir sampling).
+    No necesita la adyacencia completa en memoria; mientras lee acumula la
+    distribución de grados del grafo completo para medir el sesgo después.
+    """
+
+    def __init__(self, archivo, semilla=None):
+        self.archivo = archivo
+        self.rng = random.Random(semilla)
+        self.distribucion_grados = Counter()
+
+    def nodos(self, tamaño):
+        """Reservorio uniforme de usuarios (algoritmo R) y subgrafo inducido entre ellos"""
+        print(f"\nMuestreo por reservorio de {tamaño:,} nodos desde {self.archivo}...")
+        inicio = time.time()
+        self.distribucion_grados = Counter()
+        reservorio = []
+
+        for i, (nodo, vecinos) in enumerate(leer_lineas_conexiones(self.archivo)):
+            self.distribucion_grados[len(vecinos)] += 1
+            if i < tamaño:
+                reservorio.append((nodo, vecinos))
+            else:
+                j = self.rng.randint(0, i)
+                if j < tamaño:
+                    reservorio[j] = (nodo, vecinos)
+
+        subgrafo = construir_subgrafo(dict(reservorio), {nodo for nodo, _ in reservorio})
+        print(f"Subgrafo: {len(subgrafo):,} nodos en {time.time() - inicio:.2f}s")
+        return subgrafo
+
+    def aristas(self, tamaño):
+        """Reservorio uniforme de aristas; el subgrafo lo forman las aristas muestreadas"""
+        print(f"\nMuestreo por reservorio de {tamaño:,} aristas desde {self.archivo}...")
+        inicio = time.time()
+        self.distribucion_grados = Counter()
+        reservorio = []
+        vistas = 0
+
+        for nodo, vecinos in leer_lineas_conexiones(self.archivo):
+            self.distribucion_grados[len(vecinos)] += 1
+            for vecino in vecinos:
+                if vistas < tamaño:
+                    reservorio.append((nodo, vecino))
+                else:
+                    j = self.rng.randint(0, vistas)
+                    if j < tamaño:
+                        reservorio[j] = (nodo, vecino)
+                vistas += 1
+
+        subgrafo = construir_desde_aristas(reservorio)
+        print(f"Subgrafo: {len(subgrafo):,} nodos en {time.time() - inicio:.2f}s")
+        return subgrafo
+
+
+def distribucion_grados(grafo):
+    """Histograma {grado: número de nodos}"""
+    return Counter(len(vecinos) for vecinos in grafo.values())
+
+
+def _distancia_ks(hist1, hist2):
+    """Estadístico de Kolmogorov-Smirnov entre dos histogramas de grados"""
+    total1 = sum(hist1.values())
+    total2 = sum(hist2.values())
+    if not total1 or not total2:
+        return 1.0
+
+    acum1 = acum2 = 0
+    maximo = 0.0
+    for grado in sorted(set(hist1) | set(hist2)):
+        acum1 += hist1.get(grado, 0)
+        acum2 += hist2.get(grado, 0)
+        maximo = max(maximo, abs(acum1 / total1 - acum2 / total2))
+    return maximo
+
+
+def _grado_promedio(hist):
+    total = sum(hist.values())
+    return sum(grado * n for grado, n in hist.items()) / total if total else 0
+
+
+def _es_histograma(referencia):
+    """Un histograma {grado: número de nodos} tiene enteros como valores; un grafo, listas de vecinos"""
+    primero = next(iter(referencia.values()), None)
+    return primero is None or isinstance(primero, int)
+
+
+def sesgo_muestreo(referencia, muestra, nombre=""):
+    """
+    Compara la distribución de grados de la muestra con la del grafo completo.
+    `referencia` puede ser el grafo completo o su histograma de grados, ya sea
+    un Counter (p. ej. MuestreoReservorio.distribucion_grados) o un dict {grado: n}.
+    """
+    hist_completo = referencia if _es_histograma(referencia) else distribucion_grados(referencia)
+    hist_muestra = distribucion_grados(muestra)
+
+    promedio_completo = _grado_promedio(hist_completo)
+    promedio_muestra = _grado_promedio(hist_muestra)
+    nodos_completo = sum(hist_completo.values())
+
+    resultado = {
+        'nodos_completo': nodos_completo,
+        'nodos_muestra': len(muestra),
+        'fraccion_muestreada': len(muestra) / nodos_completo if nodos_completo else 0,
+        'grado_promedio_completo': promedio_completo,
+        'grado_promedio_muestra': promedio_muestra,
+        'ratio_grado_promedio': promedio_muestra / promedio_completo if promedio_completo else 0,
+        'ks_grados': _distancia_ks(hist_completo, hist_muestra),
+    }
+
+    print(f"\n📊 SESGO DE MUESTREO {nombre}".rstrip() + ":")
+    print(f"   • Nodos muestreados: {resultado['nodos_muestra']:,} ({resultado['fraccion_muestreada']:.1%})")
+    print(f"   • Grado promedio completo: {promedio_completo:.2f}")
+    print(f"   • Grado promedio muestra: {promedio_muestra:.2f} (ratio {resultado['ratio_grado_promedio']:.2f})")
+    print(f"   • Distancia KS de grados: {resultado['ks_grados']:.3f}")
+
+    return resultado
+
+
+ESTRATEGIAS = {
+    'caminata': MuestreoGrafo.caminata_aleatoria,
+    'incendio': MuestreoGrafo.incendio_forestal,
+    'bola_nieve': MuestreoGrafo.bola_de_nieve,
+    'aristas': MuestreoGrafo.aristas_inducidas,
+}
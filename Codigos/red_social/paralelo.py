@@ -0,0 +1,30 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+
+# Datos de solo lectura para las funciones que se ejecutan en el pool.
+# Se asignan en el proceso padre antes de crear los trabajadores, que los
+# heredan por fork sin serializarlos.
+estado = {}
+
+
+def crear_pool(procesos, **datos):
+    """
+    Pool de `procesos` trabajadores que ven `datos` en `paralelo.estado`.
+    Usa siempre el método fork: con spawn/forkserver (macOS, Linux desde
+    Python 3.14) los datos se serializarían una vez por trabajador, lo que en
+    un grafo de millones de nodos anula la ganancia. Donde no hay fork
+    (Windows) se usa un pool de hilos sobre los mismos datos.
+    """
+    estado.update(datos)
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers=procesos, mp_context=multiprocessing.get_context('fork'))
+
+    print("Aviso: fork no disponible, se usa un pool de hilos")
+    return ThreadPoolExecutor(max_workers=procesos)
+
+
+def liberar(*claves):
+    """Quita datos de `estado` cuando el pool que los usaba ya terminó"""
+    for clave in claves:
+        estado.pop(clave, None)
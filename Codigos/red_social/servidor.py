@@ -0,0 +1,388 @@
+import os
+import time
+import json
+import math
+import asyncio
+from collections import OrderedDict, defaultdict, deque
+from urllib.parse import urlsplit, parse_qs
+
+from red_social import paralelo
+from red_social.analisis import bfs_distancia
+from red_social.mst import distancia_haversine
+
+
+RUTAS = ('/vecinos', '/comunidad', '/distancia', '/cercanos', '/estadisticas')
+RUTA_DESCONOCIDA = '(desconocida)'
+RADIO_TIERRA_KM = 6371  # El mismo radio que distancia_haversine
+RADIO_MAXIMO_KM = 20040  # Media circunferencia terrestre: cubre todo el planeta
+LIMITE_MAXIMO = 10000  # Usuarios por respuesta de /cercanos
+
+
+def _columnas_totales(tamaño_celda):
+    return round(360 / tamaño_celda)
+
+
+def indexar_ubicaciones(ubicaciones, tamaño_celda=1.0):
+    """Rejilla {(fila, columna): [ids]} de celdas de tamaño_celda grados; la columna da la vuelta en ±180°"""
+    columnas_totales = _columnas_totales(tamaño_celda)
+    celdas = defaultdict(list)
+    for nodo, (lat, lon) in ubicaciones.items():
+        celda = (math.floor(lat / tamaño_celda), math.floor(lon / tamaño_celda) % columnas_totales)
+        celdas[celda].append(nodo)
+    return dict(celdas)
+
+
+def _calcular_distancia(origen, destino):
+    return bfs_distancia(paralelo.estado['grafo'], origen, destino)
+
+
+def _calcular_cercanos(lat, lon, radio_km, limite):
+    """Usuarios a menos de radio_km del punto, recorriendo solo las celdas que lo cubren"""
+    celdas = paralelo.estado['celdas']
+    ubicaciones = paralelo.estado['ubicaciones']
+    tamaño_celda = paralelo.estado['tamaño_celda']
+    columnas_totales = _columnas_totales(tamaño_celda)
+
+    # Radio angular del círculo; las filas se recortan a latitudes válidas
+    angulo = radio_km / RADIO_TIERRA_KM
+    grados = math.degrees(angulo)
+    fila_min = math.floor(max(lat - grados, -90) / tamaño_celda)
+    fila_max = math.floor(min(lat + grados, 90) / tamaño_celda)
+
+    if abs(lat) + grados >= 90:
+        # El círculo contiene un polo: abarca todas las longitudes
+        indices_columna = range(columnas_totales)
+    else:
+        # Semiancho exacto en longitud del círculo (el punto de tangencia
+        # queda más cerca del polo que el centro, así que cos(lat) se queda corto)
+        semiancho = math.degrees(math.asin(min(1.0, math.sin(angulo) / math.cos(math.radians(lat)))))
+        columna_min = math.floor((lon - semiancho) / tamaño_celda)
+        columna_max = math.floor((lon + semiancho) / tamaño_celda)
+        if columna_max - columna_min + 1 >= columnas_totales:
+            indices_columna = range(columnas_totales)
+        else:
+            # Módulo para que una búsqueda junto a ±180° también mire al otro lado
+            indices_columna = {c % columnas_totales for c in range(columna_min, columna_max + 1)}
+
+    encontrados = []
+    for fila in range(fila_min, fila_max + 1):
+        for columna in indices_columna:
+            for nodo in celdas.get((fila, columna), ()):
+                lat2, lon2 = ubicaciones[nodo]
+                distancia = distancia_haversine(lat, lon, lat2, lon2)
+                if distancia <= radio_km:
+                    encontrados.append((distancia, nodo))
+
+    encontrados.sort()
+    return [{'usuario': nodo, 'distancia_km': round(d, 3)} for d, nodo in encontrados[:limite]]
+
+
+class CacheLRU:
+    """Cache LRU de respuestas con contadores de aciertos"""
+
+    def __init__(self, capacidad=10000):
+        self.capacidad = capacidad
+        self.datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        if clave in self.datos:
+            self.datos.move_to_end(clave)
+            self.aciertos += 1
+            return self.datos[clave]
+        self.fallos += 1
+        return None
+
+    def guardar(self, clave, valor):
+        self.datos[clave] = valor
+        self.datos.move_to_end(clave)
+        if len(self.datos) > self.capacidad:
+            self.datos.popitem(last=False)
+
+
+class ErrorConsulta(Exception):
+    def __init__(self, estado, mensaje):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+class ServidorConsultas:
+    """
+    Servidor HTTP local (asyncio) que mantiene en memoria el grafo, las
+    ubicaciones y las comunidades. Las consultas ligeras se responden en el
+    bucle de eventos; BFS y búsquedas espaciales van a un pool de procesos.
+
+    Rutas (GET, respuesta JSON):
+      /vecinos?usuario=ID
+      /comunidad?usuario=ID
+      /distancia?origen=ID&destino=ID
+      /cercanos?lat=LAT&lon=LON&radio=KM&limite=N   (limite ≤ LIMITE_MAXIMO)
+      /estadisticas
+    """
+
+    def __init__(self, grafo, ubicaciones, comunidades, procesos=None, tamaño_cache=10000,
+                 tamaño_celda=1.0):
+        self.grafo = grafo
+        self.ubicaciones = ubicaciones
+        self.nodo_a_comunidad = {}
+        self.tamaños_comunidad = []
+        for i, comunidad in enumerate(comunidades):
+            self.tamaños_comunidad.append(len(comunidad))
+            for nodo in comunidad:
+                self.nodo_a_comunidad[nodo] = i
+
+        self.tamaño_celda = tamaño_celda
+        self.celdas = indexar_ubicaciones(ubicaciones, tamaño_celda)
+        self.procesos = procesos or os.cpu_count() or 1
+        self.cache = CacheLRU(tamaño_cache)
+        self.ejecutor = None
+        self.servidor = None
+
+        self.inicio = None
+        self.latencias = defaultdict(lambda: deque(maxlen=10000))
+        self.consultas = defaultdict(int)
+        self.errores = 0
+
+    async def iniciar(self, host='127.0.0.1', puerto=8765, ruta_socket=None):
+        """Arranca el pool de procesos y el servidor (TCP o socket Unix)"""
+        self.ejecutor = paralelo.crear_pool(
+            self.procesos, grafo=self.grafo, ubicaciones=self.ubicaciones,
+            celdas=self.celdas, tamaño_celda=self.tamaño_celda
+        )
+        # Crear los procesos antes de abrir el socket: si se crean al atender una
+        # conexión heredan su descriptor y el cliente nunca recibe el cierre
+        await asyncio.get_running_loop().run_in_executor(self.ejecutor, _calcular_distancia, None, None)
+
+        if ruta_socket:
+            self.servidor = await asyncio.start_unix_server(self._atender, path=ruta_socket)
+            print(f"Servidor escuchando en {ruta_socket}")
+        else:
+            self.servidor = await asyncio.start_server(self._atender, host, puerto)
+            puerto = self.servidor.sockets[0].getsockname()[1]
+            print(f"Servidor escuchando en http://{host}:{puerto}")
+        self.inicio = time.time()
+        return self.servidor
+
+    async def detener(self):
+        if self.servidor is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+            self.servidor = None
+        if self.ejecutor is not None:
+            self.ejecutor.shutdown(wait=True)
+            self.ejecutor = None
+            paralelo.liberar('grafo', 'ubicaciones', 'celdas', 'tamaño_celda')
+
+    async def servir(self, host='127.0.0.1', puerto=8765, ruta_socket=None):
+        await self.iniciar(host, puerto, ruta_socket)
+        try:
+            await self.servidor.serve_forever()
+        finally:
+            await self.detener()
+
+    @staticmethod
+    async def _leer_linea(lector, estado, mensaje):
+        """Una línea de la petición; las que superan el límite del lector (64 KiB) son un error"""
+        try:
+            return await lector.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise ErrorConsulta(estado, mensaje)
+
+    async def _atender(self, lector, escritor):
+        try:
+            inicio = time.perf_counter()
+            try:
+                linea = await self._leer_linea(lector, 400, 'Línea de petición demasiado larga')
+                while (await self._leer_linea(lector, 431, 'Cabecera demasiado larga')) not in (b'\r\n', b'\n', b''):
+                    pass  # Cabeceras ignoradas
+
+                try:
+                    metodo, objetivo, _ = linea.decode('latin-1').split(' ', 2)
+                except ValueError:
+                    raise ErrorConsulta(400, 'Petición mal formada')
+                if metodo != 'GET':
+                    raise ErrorConsulta(405, 'Solo se admite GET')
+            except ErrorConsulta as e:
+                estado, cuerpo = e.estado, {'error': str(e)}
+                self.errores += 1
+                self._registrar(RUTA_DESCONOCIDA, inicio)
+            else:
+                estado, cuerpo = await self.responder(objetivo)
+
+            datos = json.dumps(cuerpo, ensure_ascii=False).encode('utf-8')
+            escritor.write(
+                f"HTTP/1.1 {estado} {'OK' if estado == 200 else 'Error'}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(datos)}\r\n"
+                f"Connection: close\r\n\r\n".encode('latin-1') + datos
+            )
+            await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def responder(self, objetivo):
+        """Resuelve una ruta (p. ej. '/vecinos?usuario=5') y devuelve (estado, cuerpo)"""
+        inicio = time.perf_counter()
+        partes = urlsplit(objetivo)
+        ruta = partes.path.rstrip('/') or '/'
+        parametros = {clave: valores[-1] for clave, valores in parse_qs(partes.query).items()}
+
+        try:
+            if ruta == '/estadisticas':
+                estado, cuerpo = 200, self.estadisticas()
+            else:
+                clave = (ruta, tuple(sorted(parametros.items())))
+                cuerpo = self.cache.obtener(clave)
+                if cuerpo is None:
+                    cuerpo = await self._resolver(ruta, parametros)
+                    self.cache.guardar(clave, cuerpo)
+                estado = 200
+        except ErrorConsulta as e:
+            estado, cuerpo = e.estado, {'error': str(e)}
+            self.errores += 1
+        except Exception as e:
+            estado, cuerpo = 500, {'error': f"Error interno: {e}"}
+            self.errores += 1
+
+        # Rutas desconocidas bajo una sola clave para no crecer sin límite
+        self._registrar(ruta if ruta in RUTAS else RUTA_DESCONOCIDA, inicio)
+        return estado, cuerpo
+
+    def _registrar(self, ruta, inicio):
+        self.consultas[ruta] += 1
+        self.latencias[ruta].append(time.perf_counter() - inicio)
+
+    def _usuario(self, parametros, nombre='usuario'):
+        try:
+            return int(parametros[nombre])
+        except KeyError:
+            raise ErrorConsulta(400, f"Falta el parámetro '{nombre}'")
+        except ValueError:
+            raise ErrorConsulta(400, f"Parámetro '{nombre}' inválido")
+
+    def _numero(self, parametros, nombre, defecto=None, minimo=None, maximo=None):
+        """Número finito dentro de [minimo, maximo]; si no, error 400"""
+        if nombre not in parametros:
+            if defecto is None:
+                raise ErrorConsulta(400, f"Falta el parámetro '{nombre}'")
+            return defecto
+        try:
+            valor = float(parametros[nombre])
+        except ValueError:
+            raise ErrorConsulta(400, f"Parámetro '{nombre}' inválido")
+        if not math.isfinite(valor):
+            raise ErrorConsulta(400, f"Parámetro '{nombre}' debe ser un número finito")
+        if minimo is not None and valor < minimo:
+            raise ErrorConsulta(400, f"Parámetro '{nombre}' debe ser ≥ {minimo}")
+        if maximo is not None and valor > maximo:
+            raise ErrorConsulta(400, f"Parámetro '{nombre}' debe ser ≤ {maximo}")
+        return valor
+
+    async def _resolver(self, ruta, parametros):
+        if ruta == '/vecinos':
+            usuario = self._usuario(parametros)
+            if usuario not in self.grafo:
+                raise ErrorConsulta(404, f"Usuario {usuario} no está en el grafo")
+            return {'usuario': usuario, 'vecinos': list(self.grafo[usuario])}
+
+        if ruta == '/comunidad':
+            usuario = self._usuario(parametros)
+            if usuario not in self.nodo_a_comunidad:
+                raise ErrorConsulta(404, f"Usuario {usuario} no pertenece a ninguna comunidad")
+            comunidad = self.nodo_a_comunidad[usuario]
+            return {'usuario': usuario, 'comunidad': comunidad,
+                    'tamaño': self.tamaños_comunidad[comunidad]}
+
+        loop = asyncio.get_running_loop()
+
+        if ruta == '/distancia':
+            origen = self._usuario(parametros, 'origen')
+            destino = self._usuario(parametros, 'destino')
+            for usuario in (origen, destino):
+                if usuario not in self.grafo:
+                    raise ErrorConsulta(404, f"Usuario {usuario} no está en el grafo")
+            distancia = await loop.run_in_executor(self.ejecutor, _calcular_distancia, origen, destino)
+            return {'origen': origen, 'destino': destino, 'distancia': distancia}
+
+        if ruta == '/cercanos':
+            lat = self._numero(parametros, 'lat', minimo=-90, maximo=90)
+            lon = self._numero(parametros, 'lon', minimo=-180, maximo=180)
+            radio = min(self._numero(parametros, 'radio', 10.0, minimo=0), RADIO_MAXIMO_KM)
+            limite = int(self._numero(parametros, 'limite', 100, minimo=0, maximo=LIMITE_MAXIMO))
+            cercanos = await loop.run_in_executor(self.ejecutor, _calcular_cercanos, lat, lon, radio, limite)
+            return {'lat': lat, 'lon': lon, 'radio_km': radio, 'usuarios': cercanos}
+
+        raise ErrorConsulta(404, f"Ruta desconocida: {ruta}")
+
+    def estadisticas(self):
+        """Latencia por ruta (ms), rendimiento global y uso de la cache"""
+        activo = time.time() - self.inicio if self.inicio else 0
+        total = sum(self.consultas.values())
+        rutas = {}
+        for ruta, latencias in self.latencias.items():
+            ordenadas = sorted(latencias)
+            rutas[ruta] = {
+                'consultas': self.consultas[ruta],
+                'promedio_ms': 1000 * sum(ordenadas) / len(ordenadas),
+                'p50_ms': 1000 * ordenadas[len(ordenadas) // 2],
+                'p95_ms': 1000 * ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.95))],
+                'max_ms': 1000 * ordenadas[-1],
+            }
+
+        consultas_cache = self.cache.aciertos + self.cache.fallos
+        return {
+            'segundos_activo': activo,
+            'consultas': total,
+            'errores': self.errores,
+            'consultas_por_segundo': total / activo if activo else 0,
+            'cache': {
+                'entradas': len(self.cache.datos),
+                'aciertos': self.cache.aciertos,
+                'fallos': self.cache.fallos,
+                'tasa_aciertos': self.cache.aciertos / consultas_cache if consultas_cache else 0,
+            },
+            'rutas': rutas,
+        }
+
+
+async def consultar(ruta, host='127.0.0.1', puerto=8765, ruta_socket=None):
+    """Cliente local mínimo: hace GET a `ruta` y devuelve (estado, json)"""
+    if ruta_socket:
+        lector, escritor = await asyncio.open_unix_connection(ruta_socket)
+    else:
+        lector, escritor = await asyncio.open_connection(host, puerto)
+
+    escritor.write(f"GET {ruta} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode('latin-1'))
+    await escritor.drain()
+    respuesta = await lector.read()
+    escritor.close()
+    await escritor.wait_closed()
+
+    cabecera, _, cuerpo = respuesta.partition(b'\r\n\r\n')
+    estado = int(cabecera.split(b' ', 2)[1])
+    return estado, json.loads(cuerpo.decode('utf-8'))
+
+
+def main():
+    """Carga los datos una sola vez y deja el servidor atendiendo consultas"""
+    from red_social.cargador import CargadorRedSocial
+    from red_social.comunidades import DeteccionPorPropagacion
+
+    cargador = CargadorRedSocial()
+    cargador.cargar_ubicaciones("10_million_location.txt")
+    cargador.cargar_conexiones("10_million_user.txt")
+    subgrafo = cargador.obtener_subgrafo(tamaño=10000000)
+    comunidades = DeteccionPorPropagacion(subgrafo).ejecutar_propagacion()
+
+    servidor = ServidorConsultas(subgrafo, cargador.ubicaciones, comunidades)
+    try:
+        asyncio.run(servidor.servir())
+    except KeyboardInterrupt:
+        print("\nServidor detenido.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import time
+import random
+import bisect
+import itertools
+from collections import defaultdict
+
+from red_social import paralelo
+
+
+_VACIO = frozenset()
+
+
+def _contar_bloque(nodos):
+    """Cuenta los triángulos cuyo vértice de menor rango está en `nodos`"""
+    salientes = paralelo.estado['salientes']
+    etiquetas = paralelo.estado['etiquetas']
+    total = 0
+    por_nodo = defaultdict(int)
+    internos = defaultdict(int)
+
+    for u in nodos:
+        salientes_u = salientes[u]
+        for v in salientes_u:
+            comunes = salientes_u & salientes.get(v, _VACIO)
+            if not comunes:
+                continue
+            total += len(comunes)
+            por_nodo[u] += len(comunes)
+            por_nodo[v] += len(comunes)
+            for w in comunes:
+                por_nodo[w] += 1
+
+            if etiquetas is not None:
+                com = etiquetas.get(u)
+                if com is not None and etiquetas.get(v) == com:
+                    internos[com] += sum(1 for w in comunes if etiquetas.get(w) == com)
+
+    return total, por_nodo, internos
+
+
+class ConteoTriangulos:
+    """
+    Conteo de triángulos y coeficientes de clustering.
+    Ordena los nodos por (grado, id) y orienta cada arista hacia el nodo de mayor
+    rango: cada triángulo se encuentra una sola vez intersectando los conjuntos
+    de vecinos salientes, y ningún nodo tiene más de O(√m) salientes.
+    """
+
+    def __init__(self, grafo):
+        self.grafo = grafo
+        self.grados = {nodo: len(vecinos) for nodo, vecinos in grafo.items()}
+        self._conjuntos = {}
+
+    def _orientar(self):
+        grados = self.grados
+        salientes = {}
+        for u, vecinos in self.grafo.items():
+            rango_u = (grados[u], u)
+            salientes[u] = frozenset(v for v in vecinos if (grados.get(v, 0), v) > rango_u)
+        return salientes
+
+    def _cuñas(self, grado):
+        return grado * (grado - 1) // 2
+
+    def contar(self, etiquetas=None, procesos=1, tamaño_bloque=50000):
+        """
+        Conteo exacto. `etiquetas` ({nodo: comunidad}) activa el conteo de
+        triángulos internos por comunidad. Con procesos > 1 los bloques de
+        nodos se reparten entre procesos trabajadores.
+        """
+        print(f"\nContando triángulos en {len(self.grafo):,} nodos...")
+        inicio = time.time()
+
+        salientes = self._orientar()
+        nodos = list(salientes)
+        bloques = [nodos[i:i + tamaño_bloque] for i in range(0, len(nodos), tamaño_bloque)]
+
+        try:
+            if procesos > 1 and len(bloques) > 1:
+                with paralelo.crear_pool(procesos, salientes=salientes, etiquetas=etiquetas) as ejecutor:
+                    parciales = list(ejecutor.map(_contar_bloque, bloques))
+            else:
+                paralelo.estado.update(salientes=salientes, etiquetas=etiquetas)
+                parciales = [_contar_bloque(bloque) for bloque in bloques]
+        finally:
+            paralelo.liberar('salientes', 'etiquetas')
+
+        total = 0
+        por_nodo = defaultdict(int)
+        internos = defaultdict(int)
+        for total_bloque, por_nodo_bloque, internos_bloque in parciales:
+            total += total_bloque
+            for nodo, t in por_nodo_bloque.items():
+                por_nodo[nodo] += t
+            for com, t in internos_bloque.items():
+                internos[com] += t
+
+        cuñas = sum(self._cuñas(g) for g in self.grados.values())
+        suma_locales = sum(
+            por_nodo.get(nodo, 0) / self._cuñas(g)
+            for nodo, g in self.grados.items() if g >= 2
+        )
+
+        resultado = {
+            'triangulos': total,
+            'clustering_global': 3 * total / cuñas if cuñas else 0,
+            'clustering_promedio': suma_locales / len(self.grados) if self.grados else 0,
+            'triangulos_por_nodo': dict(por_nodo),
+            'aproximado': False,
+        }
+        if etiquetas is not None:
+            resultado['triangulos_comunidad'] = dict(internos)
+            resultado['comunidades_estimadas'] = set()
+
+        print(f"Triángulos: {total:,} en {time.time() - inicio:.2f}s")
+        return resultado
+
+    def _vecindad(self, nodo):
+        conjunto = self._conjuntos.get(nodo)
+        if conjunto is None:
+            conjunto = self._conjuntos[nodo] = frozenset(self.grafo.get(nodo, ()))
+        return conjunto
+
+    def _cuña_cerrada(self, vecinos, rng):
+        a, b = rng.sample(vecinos, 2)
+        return b in self._vecindad(a)
+
+    def aproximar(self, muestras=100000, etiquetas=None, semilla=None):
+        """
+        Estimación por muestreo de cuñas (caminos de longitud 2):
+        la fracción de cuñas cerradas estima el clustering global y, muestreando
+        un nodo uniforme por cuña, el clustering promedio.
+        """
+        print(f"\nEstimando triángulos con {muestras:,} cuñas muestreadas...")
+        inicio = time.time()
+        rng = random.Random(semilla)
+        self._conjuntos = {}
+
+        nodos = list(self.grafo)
+        cuñas_nodo = [self._cuñas(self.grados[nodo]) for nodo in nodos]
+        acumuladas = list(itertools.accumulate(cuñas_nodo))
+        cuñas = acumuladas[-1] if acumuladas else 0
+
+        # Clustering global: cuñas uniformes (nodo ∝ C(grado, 2))
+        cerradas = 0
+        if cuñas:
+            for _ in range(muestras):
+                centro = nodos[bisect.bisect_right(acumuladas, rng.random() * cuñas)]
+                cerradas += self._cuña_cerrada(self.grafo[centro], rng)
+        clustering_global = cerradas / muestras if cuñas and muestras else 0
+
+        # Clustering promedio: nodos uniformes (grado < 2 cuenta como 0)
+        cerradas = 0
+        for _ in range(muestras if nodos else 0):
+            centro = rng.choice(nodos)
+            if self.grados[centro] >= 2:
+                cerradas += self._cuña_cerrada(self.grafo[centro], rng)
+        clustering_promedio = cerradas / muestras if nodos and muestras else 0
+
+        resultado = {
+            'triangulos': round(clustering_global * cuñas / 3),
+            'clustering_global': clustering_global,
+            'clustering_promedio': clustering_promedio,
+            'aproximado': True,
+        }
+
+        if etiquetas is not None:
+            resultado['triangulos_comunidad'], resultado['comunidades_estimadas'] = \
+                self._aproximar_comunidades(etiquetas, muestras, rng)
+
+        self._conjuntos = {}
+        print(f"Triángulos estimados: {resultado['triangulos']:,} en {time.time() - inicio:.2f}s")
+        return resultado
+
+    def _aproximar_comunidades(self, etiquetas, muestras, rng, umbral_exacto=5000, minimo=200):
+        """
+        Triángulos internos por comunidad. Las comunidades con pocas cuñas
+        internas (≤ umbral_exacto) se cuentan exactamente revisando todas sus
+        cuñas; en las demás se muestrean cuñas internas, repartiendo `muestras`
+        en proporción a sus cuñas y con al menos `minimo` por comunidad, para
+        que ninguna quede sin estimar.
+        Devuelve ({comunidad: triángulos}, comunidades estimadas por muestreo).
+        """
+        nodos_comunidad = defaultdict(list)
+        cuñas_nodo = defaultdict(list)
+        for nodo, vecinos in self.grafo.items():
+            com = etiquetas.get(nodo)
+            if com is None:
+                continue
+            grado_interno = sum(1 for v in vecinos if etiquetas.get(v) == com)
+            if grado_interno >= 2:
+                nodos_comunidad[com].append(nodo)
+                cuñas_nodo[com].append(self._cuñas(grado_interno))
+
+        def vecinos_internos(nodo, com):
+            return [v for v in self.grafo[nodo] if etiquetas.get(v) == com]
+
+        triangulos = {}
+        grandes = {}
+        for com, nodos in nodos_comunidad.items():
+            cuñas = sum(cuñas_nodo[com])
+            if cuñas > umbral_exacto:
+                grandes[com] = cuñas
+                continue
+            # Cada triángulo cierra exactamente tres cuñas
+            cerradas = 0
+            for nodo in nodos:
+                for a, b in itertools.combinations(vecinos_internos(nodo, com), 2):
+                    cerradas += b in self._vecindad(a)
+            triangulos[com] = cerradas // 3
+
+        cuñas_grandes = sum(grandes.values())
+        for com, cuñas in grandes.items():
+            nodos = nodos_comunidad[com]
+            acumuladas = list(itertools.accumulate(cuñas_nodo[com]))
+            muestras_com = max(minimo, round(muestras * cuñas / cuñas_grandes))
+            cerradas = 0
+            for _ in range(muestras_com):
+                centro = nodos[bisect.bisect_right(acumuladas, rng.random() * cuñas)]
+                cerradas += self._cuña_cerrada(vecinos_internos(centro, com), rng)
+            triangulos[com] = round(cerradas / muestras_com * cuñas / 3)
+
+        return triangulos, set(grandes)
+
+
+def estadisticas_triangulos_comunidades(comunidades, subgrafo, aproximado=False, muestras=100000,
+                                        procesos=1, semilla=None):
+    """
+    Densidad local de las comunidades: clustering global/promedio del subgrafo
+    y densidad de triángulos internos de cada comunidad.
+    """
+    print(f"\n{'='*60}")
+    print(f"TRIÁNGULOS Y CLUSTERING{' (APROXIMADO)' if aproximado else ''}".center(60))
+    print(f"{'='*60}")
+
+    if not comunidades:
+        print("No se detectaron comunidades")
+        return
+
+    nodo_a_comunidad = {}
+    for i, comunidad in enumerate(comunidades):
+        for nodo in comunidad:
+            nodo_a_comunidad[nodo] = i
+
+    conteo = ConteoTriangulos(subgrafo)
+    if aproximado:
+        resultado = conteo.aproximar(muestras=muestras, etiquetas=nodo_a_comunidad, semilla=semilla)
+    else:
+        resultado = conteo.contar(etiquetas=nodo_a_comunidad, procesos=procesos)
+
+    estimadas = resultado['comunidades_estimadas']
+    por_comunidad = []
+    for i, comunidad in enumerate(comunidades):
+        n = len(comunidad)
+        triangulos = resultado['triangulos_comunidad'].get(i, 0)
+        posibles = n * (n - 1) * (n - 2) // 6
+        por_comunidad.append({
+            'comunidad': i,
+            'tamaño': n,
+            'triangulos': triangulos,
+            'densidad_triangulos': triangulos / posibles if posibles else 0,
+            'aproximado': i in estimadas,
+        })
+
+    con_triangulos = [c for c in por_comunidad if c['triangulos'] > 0]
+    print(f"🔺 TRIÁNGULOS:")
+    print(f"   • Total triángulos: {resultado['triangulos']:,}")
+    print(f"   • Clustering global (transitividad): {resultado['clustering_global']:.4f}")
+    print(f"   • Clustering promedio: {resultado['clustering_promedio']:.4f}")
+    print(f"   • Triángulos internos a comunidades: {sum(c['triangulos'] for c in por_comunidad):,}")
+    print(f"   • Comunidades con triángulos: {len(con_triangulos)} de {len(comunidades)}")
+    if aproximado:
+        print(f"   • Comunidades estimadas por muestreo: {len(estimadas)} (el resto, conteo exacto)")
+
+    print(f"\nTOP 10 COMUNIDADES MÁS DENSAS (≥ 5 nodos):")
+    candidatas = sorted(
+        (c for c in por_comunidad if c['tamaño'] >= 5),
+        key=lambda c: c['densidad_triangulos'], reverse=True
+    )
+    for posicion, c in enumerate(candidatas[:10], 1):
+        print(f"  {posicion:2d}. Comunidad {c['comunidad'] + 1}: {c['tamaño']:,} nodos, "
+              f"{'~' if c['aproximado'] else ''}{c['triangulos']:,} triángulos, "
+              f"densidad {c['densidad_triangulos']:.4f}")
+
+    resultado['comunidades'] = por_comunidad
+    return resultado